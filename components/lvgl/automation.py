@@ -32,15 +32,14 @@ from .lvcode import (
     LocalVariable,
     LvglComponent,
     ReturnStatement,
-    add_line_marks,
     lv,
-    lv_add,
     lv_expr,
     lv_obj,
     lvgl_comp,
+    single_lambda,
 )
 from .schemas import (
-    ALL_STYLES,
+    ALL_STYLES_KEYS,
     DISP_BG_SCHEMA,
     LIST_ACTION_SCHEMA,
     LVGL_SCHEMA,
@@ -72,31 +71,42 @@ focused_widgets = set()
 refreshed_widgets = set()
 
 
+async def layer_to_code(name, layer, config):
+    """
+    Apply properties and add widgets to a display layer
+    :param name: The name of the local variable holding the layer
+    :param layer: An expression for the layer object
+    :param config: The layer configuration
+    """
+    with LocalVariable(name, lv_obj_t, layer) as layer_obj:
+        layer_w = Widget(layer_obj, layer_spec, config)
+        await set_obj_properties(layer_w, config)
+        await add_widgets(layer_w, config)
+
+
 async def layers_to_code(lv_component, config):
+    # Layers are generated one after the other since the code for each is emitted into
+    # the same (global) code context.
     if top_conf := config.get(CONF_TOP_LAYER):
         top_layer = lv_expr.display_get_layer_top(lv_component.get_disp())
-        with LocalVariable("top_layer", lv_obj_t, top_layer) as top_layer_obj:
-            top_w = Widget(top_layer_obj, layer_spec, top_conf)
-            await set_obj_properties(top_w, top_conf)
-            await add_widgets(top_w, top_conf)
+        await layer_to_code("top_layer", top_layer, top_conf)
     if bottom_conf := config.get(CONF_BOTTOM_LAYER):
         bottom_layer = lv_expr.display_get_layer_bottom(lv_component.get_disp())
-        with LocalVariable("bottom_layer", lv_obj_t, bottom_layer) as bottom_layer_obj:
-            bottom_w = Widget(bottom_layer_obj, layer_spec, bottom_conf)
-            await set_obj_properties(bottom_w, bottom_conf)
-            await add_widgets(bottom_w, bottom_conf)
+        await layer_to_code("bottom_layer", bottom_layer, bottom_conf)
 
 
 async def lvgl_update(lv_component, config):
-    bottom = {k.removeprefix("disp_"): v for k, v in config.items() if k in DISP_PROPS}
-    if not bottom:
+    # Single scan of the config; the same keys drive both the layer config and the warning
+    keys = [k for k in config if k in DISP_PROPS]
+    if not keys:
         return
+    bottom = {DISP_PROPS[k]: config[k] for k in keys}
     plural = len(bottom) != 1
     add_warning(
         "The propert"
         + ("ies " if plural else "y ")
         + "'"
-        + "','".join(k for k in config if k in DISP_PROPS)
+        + "','".join(keys)
         + "'"
         + (" are " if plural else " is ")
         + "deprecated, use 'bottom_layer' instead."
@@ -116,11 +126,16 @@ async def action_to_code(
     config=None,
 ):
     # Ensure all required ids have been processed, so our LambdaContext doesn't get context-switched.
+    # Each id is resolved only once, even if referenced by several lambdas.
     if config:
-        for lamb in config.values():
-            if isinstance(lamb, Lambda):
-                for id_ in lamb.requires_ids:
-                    await get_variable(id_)
+        ids = dict.fromkeys(
+            id_
+            for lamb in config.values()
+            if isinstance(lamb, Lambda)
+            for id_ in lamb.requires_ids
+        )
+        for id_ in ids:
+            await get_variable(id_)
     await wait_for_widgets()
     async with LambdaContext(parameters=args, where=action_id) as context:
         for widget in widgets:
@@ -144,6 +159,20 @@ async def update_to_code(config, action_id, template_arg, args):
     )
 
 
+async def lvgl_condition_to_code(lvgl, condition_id, template_arg, expression):
+    """
+    Create an LvglCondition returning the value of an expression, parented to the LVGL component
+    """
+    lamb = await single_lambda(
+        ReturnStatement(expression), LVGL_COMP_ARG, return_type=cg.bool_
+    )
+    var = cg.new_Pvariable(
+        condition_id, TemplateArguments(LvglComponent, *template_arg), lamb
+    )
+    await cg.register_parented(var, lvgl)
+    return var
+
+
 @automation.register_condition(
     "lvgl.is_paused",
     LvglCondition,
@@ -151,15 +180,9 @@ async def update_to_code(config, action_id, template_arg, args):
 )
 async def lvgl_is_paused(config, condition_id, template_arg, args):
     lvgl = config[CONF_LVGL_ID]
-    async with LambdaContext(LVGL_COMP_ARG, return_type=cg.bool_) as context:
-        lv_add(ReturnStatement(lvgl_comp.is_paused()))
-    var = cg.new_Pvariable(
-        condition_id,
-        TemplateArguments(LvglComponent, *template_arg),
-        await context.get_lambda(),
+    return await lvgl_condition_to_code(
+        lvgl, condition_id, template_arg, lvgl_comp.is_paused()
     )
-    await cg.register_parented(var, lvgl)
-    return var
 
 
 @automation.register_condition(
@@ -176,19 +199,12 @@ async def lvgl_is_paused(config, condition_id, template_arg, args):
 async def lvgl_is_idle(config, condition_id, template_arg, args):
     lvgl = config[CONF_LVGL_ID]
     timeout = await lv_milliseconds.process(config[CONF_TIMEOUT])
-    async with LambdaContext(LVGL_COMP_ARG, return_type=cg.bool_) as context:
-        lv_add(
-            ReturnStatement(
-                lv_expr.disp_get_inactive_time(lvgl_comp.get_disp()) > timeout
-            )
-        )
-    var = cg.new_Pvariable(
+    return await lvgl_condition_to_code(
+        lvgl,
         condition_id,
-        TemplateArguments(LvglComponent, *template_arg),
-        await context.get_lambda(),
+        template_arg,
+        lv_expr.disp_get_inactive_time(lvgl_comp.get_disp()) > timeout,
     )
-    await cg.register_parented(var, lvgl)
-    return var
 
 
 @automation.register_action(
@@ -217,24 +233,29 @@ async def obj_invalidate_to_code(config, action_id, template_arg, args):
     return await action_to_code(widgets, do_invalidate, action_id, template_arg, args)
 
 
-layer_spec = WidgetType(CONF_OBJ, lv_obj_t, (CONF_MAIN, CONF_SCROLLBAR), is_mock=True)
-
-DISP_PROPS = {str(x) for x in DISP_BG_SCHEMA.schema}
+LAYER_PARTS = (CONF_MAIN, CONF_SCROLLBAR)
+layer_spec = WidgetType(CONF_OBJ, lv_obj_t, LAYER_PARTS, is_mock=True)
 
+# Map each deprecated disp_* property to the equivalent bottom layer property
+DISP_PROPS = {
+    str(x): str(x).removeprefix("disp_") for x in DISP_BG_SCHEMA.schema
+}
 
-@automation.register_action(
-    "lvgl.update",
-    LvglAction,
-    part_schema(layer_spec.parts)
-    .extend(LVGL_SCHEMA)
+# Build the layer part schema once and share it between the top, bottom and update schemas
+LAYER_PART_SCHEMA = part_schema(layer_spec.parts)
+UPDATE_SCHEMA = (
+    LAYER_PART_SCHEMA.extend(LVGL_SCHEMA)
     .extend(DISP_BG_SCHEMA)
     .extend(
         {
-            cv.Optional(CONF_TOP_LAYER): part_schema(layer_spec.parts),
-            cv.Optional(CONF_BOTTOM_LAYER): part_schema(layer_spec.parts),
+            cv.Optional(CONF_TOP_LAYER): LAYER_PART_SCHEMA,
+            cv.Optional(CONF_BOTTOM_LAYER): LAYER_PART_SCHEMA,
         }
-    ),
+    )
 )
+
+
+@automation.register_action("lvgl.update", LvglAction, UPDATE_SCHEMA)
 async def lvgl_update_to_code(config, action_id, template_arg, args):
     widgets = await get_widgets(config, CONF_LVGL_ID)
     w = widgets[0]
@@ -245,6 +266,19 @@ async def lvgl_update_to_code(config, action_id, template_arg, args):
     return var
 
 
+async def lvgl_action_to_code(config, action_id, template_arg, expression):
+    """
+    Generate an LvglAction whose lambda consists of a single expression on the LVGL component
+    :param config: The action config, containing the LVGL component id
+    :param expression: The expression to evaluate when the action runs
+    """
+    lv_comp = await cg.get_variable(config[CONF_LVGL_ID])
+    lamb = await single_lambda(expression, LVGL_COMP_ARG, where=action_id)
+    var = cg.new_Pvariable(action_id, template_arg, lamb)
+    await cg.register_parented(var, lv_comp)
+    return var
+
+
 @automation.register_action(
     "lvgl.pause",
     LvglAction,
@@ -255,13 +289,12 @@ async def lvgl_update_to_code(config, action_id, template_arg, args):
     ),
 )
 async def pause_action_to_code(config, action_id, template_arg, args):
-    lv_comp = await cg.get_variable(config[CONF_LVGL_ID])
-    async with LambdaContext(LVGL_COMP_ARG) as context:
-        add_line_marks(where=action_id)
-        lv_add(lvgl_comp.set_paused(True, config[CONF_SHOW_SNOW]))
-    var = cg.new_Pvariable(action_id, template_arg, await context.get_lambda())
-    await cg.register_parented(var, lv_comp)
-    return var
+    return await lvgl_action_to_code(
+        config,
+        action_id,
+        template_arg,
+        lvgl_comp.set_paused(True, config[CONF_SHOW_SNOW]),
+    )
 
 
 @automation.register_action(
@@ -270,12 +303,9 @@ async def pause_action_to_code(config, action_id, template_arg, args):
     LVGL_SCHEMA,
 )
 async def resume_action_to_code(config, action_id, template_arg, args):
-    lv_comp = await cg.get_variable(config[CONF_LVGL_ID])
-    async with LambdaContext(LVGL_COMP_ARG, where=action_id) as context:
-        lv_add(lvgl_comp.set_paused(False, False))
-    var = cg.new_Pvariable(action_id, template_arg, await context.get_lambda())
-    await cg.register_parented(var, lv_comp)
-    return var
+    return await lvgl_action_to_code(
+        config, action_id, template_arg, lvgl_comp.set_paused(False, False)
+    )
 
 
 @automation.register_action("lvgl.widget.disable", ObjUpdateAction, LIST_ACTION_SCHEMA)
@@ -298,14 +328,23 @@ async def obj_enable_to_code(config, action_id, template_arg, args):
     )
 
 
+async def get_outer_widgets(config) -> list[Widget]:
+    """
+    Get the widgets referenced by a config, substituting the outer container where one exists,
+    as used by the hide and show actions.
+    """
+    return [
+        outer if (outer := widget.outer) else widget
+        for widget in await get_widgets(config)
+    ]
+
+
 @automation.register_action("lvgl.widget.hide", ObjUpdateAction, LIST_ACTION_SCHEMA)
 async def obj_hide_to_code(config, action_id, template_arg, args):
     async def do_hide(widget: Widget):
         widget.add_flag("LV_OBJ_FLAG_HIDDEN")
 
-    widgets = [
-        widget.outer if widget.outer else widget for widget in await get_widgets(config)
-    ]
+    widgets = await get_outer_widgets(config)
     return await action_to_code(widgets, do_hide, action_id, template_arg, args)
 
 
@@ -316,9 +355,7 @@ async def obj_show_to_code(config, action_id, template_arg, args):
         if widget.move_to_foreground:
             lv_obj.move_foreground(widget.obj)
 
-    widgets = [
-        widget.outer if widget.outer else widget for widget in await get_widgets(config)
-    ]
+    widgets = await get_outer_widgets(config)
     return await action_to_code(widgets, do_show, action_id, template_arg, args)
 
 
@@ -328,32 +365,31 @@ def focused_id(value):
     return value
 
 
-@automation.register_action(
-    "lvgl.widget.focus",
-    ObjUpdateAction,
-    cv.Any(
-        cv.maybe_simple_value(
-            LVGL_SCHEMA.extend(
-                {
-                    cv.Optional(CONF_GROUP): cv.use_id(lv_group_t),
-                    cv.Required(CONF_ACTION): cv.one_of(
-                        "MARK", "RESTORE", "NEXT", "PREVIOUS", upper=True
-                    ),
-                    cv.Optional(CONF_FREEZE, default=False): cv.boolean,
-                }
-            ),
-            key=CONF_ACTION,
-        ),
-        cv.maybe_simple_value(
+FOCUS_SCHEMA = cv.Any(
+    cv.maybe_simple_value(
+        LVGL_SCHEMA.extend(
             {
-                cv.Required(CONF_ID): focused_id,
+                cv.Optional(CONF_GROUP): cv.use_id(lv_group_t),
+                cv.Required(CONF_ACTION): cv.one_of(
+                    "MARK", "RESTORE", "NEXT", "PREVIOUS", upper=True
+                ),
                 cv.Optional(CONF_FREEZE, default=False): cv.boolean,
-                cv.Optional(CONF_EDITING, default=False): cv.boolean,
-            },
-            key=CONF_ID,
+            }
         ),
+        key=CONF_ACTION,
+    ),
+    cv.maybe_simple_value(
+        {
+            cv.Required(CONF_ID): focused_id,
+            cv.Optional(CONF_FREEZE, default=False): cv.boolean,
+            cv.Optional(CONF_EDITING, default=False): cv.boolean,
+        },
+        key=CONF_ID,
     ),
 )
+
+
+@automation.register_action("lvgl.widget.focus", ObjUpdateAction, FOCUS_SCHEMA)
 async def widget_focus(config, action_id, template_arg, args):
     widget = await get_widgets(config)
     if widget:
@@ -429,14 +465,24 @@ async def obj_refresh_to_code(config, action_id, template_arg, args):
     widget = await get_widgets(config)
 
     async def do_refresh(widget: Widget):
-        # only update style properties that might have changed, i.e. are templated
-        config = {k: v for k, v in widget.config.items() if isinstance(v, Lambda)}
-        await set_obj_properties(widget, config)
+        # only update style properties that might have changed, i.e. are templated.
+        # Also collect the widget-specific options, i.e. everything except common style properties,
+        # in the same pass, noting whether any is dynamic (a Lambda or a dict).
+        templated = {}
+        config = {}
+        dynamic = False
+        for k, v in widget.config.items():
+            is_lambda = isinstance(v, Lambda)
+            if is_lambda:
+                templated[k] = v
+            if k not in ALL_STYLES_KEYS:
+                config[k] = v
+                dynamic = dynamic or is_lambda or isinstance(v, dict)
+        if templated:
+            await set_obj_properties(widget, templated)
         # must pass all widget-specific options here, even if not templated, but only do so if at least one is
-        # templated. First filter out common style properties.
-        config = {k: v for k, v in widget.config.items() if k not in ALL_STYLES}
-        # Check if v is a Lambda or a dict, implying it is dynamic
-        if any(isinstance(v, (Lambda, dict)) for v in config.values()):
+        # templated.
+        if dynamic:
             await widget.type.to_code(widget, config)
             if (
                 widget.type.w_type.value_property is not None
@@ -4,6 +4,7 @@ Constants already defined in esphome.const are not duplicated here and must be i
 
 """
 
+import functools
 import logging
 from typing import Any
 
@@ -29,6 +30,9 @@ KEY_LV_DEFINES = "lv_defines"
 KEY_UPDATED_WIDGETS = "updated_widgets"
 KEY_WARNINGS = "warnings"
 KEY_REMAPPED_USES = "remapped_uses"
+KEY_GRID_TEMPLATES = "grid_templates"
+KEY_TRANSITION_PROPS = "transition_props"
+KEY_TRANSITIONS = "transitions"
 
 
 def get_data(key, default=None):
@@ -38,9 +42,13 @@ def get_data(key, default=None):
     :param default: The default data - the default is an empty dict
     :return:
     """
-    return CORE.data.setdefault(DOMAIN, {}).setdefault(
-        key, {} if default is None else default
-    )
+    data = CORE.data.get(DOMAIN)
+    if data is None:
+        data = CORE.data[DOMAIN] = {}
+    if (result := data.get(key)) is None:
+        # Only create the default when the key is missing
+        result = data[key] = {} if default is None else default
+    return result
 
 
 def get_warnings():
@@ -56,23 +64,29 @@ def add_warning(msg: str):
 
 
 class StaticCastExpression(Expression):
-    __slots__ = ("type", "exp")
+    __slots__ = ("type", "exp", "_text")
 
     def __init__(self, type: Any, exp: SafeExpType):
         self.type = str(type)
         self.exp = cg.safe_exp(exp)
+        self._text = None
 
     def __str__(self):
-        return f"static_cast<{self.type}>({self.exp})"
+        # Rendered on first use rather than on construction, in case the wrapped expression
+        # refers to an id that is not yet resolved.
+        if self._text is None:
+            self._text = f"static_cast<{self.type}>({self.exp})"
+        return self._text
 
 
 def add_define(macro, value="1"):
     lv_defines = get_data(KEY_LV_DEFINES)
     value = str(value)
-    if lv_defines.setdefault(macro, value) != value:
-        LOGGER.error(
-            "Redefinition of %s - was %s now %s", macro, lv_defines[macro], value
-        )
+    existing = lv_defines.get(macro)
+    if existing == value:
+        return
+    if existing is not None:
+        LOGGER.error("Redefinition of %s - was %s now %s", macro, existing, value)
     lv_defines[macro] = value
 
 
@@ -86,6 +100,28 @@ def addr(arg) -> MockObj:
     return MockObj(f"&{arg}")
 
 
+@functools.lru_cache(maxsize=512)
+def reduce_lambda_text(content: str) -> str | None:
+    """
+    If a lambda body consists of a single return statement, get the returned expression text
+    :param content: The lambda body
+    :return: The expression text, or None if the lambda can't be reduced
+    """
+    expr = content.strip()
+    if expr.startswith("return") and expr.endswith(";"):
+        return expr[6:-1].strip()
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def parameter_ref(name: str) -> MockObj:
+    """
+    Get an expression referring to a lambda parameter by name. The set of names is small and fixed,
+    so the expressions are shared between calls.
+    """
+    return MockObj(name)
+
+
 def call_lambda(lamb: LambdaExpression):
     """
     Given a lambda, either reduce to a simple expression or call it, possibly with parameters
@@ -93,10 +129,9 @@ def call_lambda(lamb: LambdaExpression):
     :param lamb:
     :return:
     """
-    expr = lamb.content.strip()
-    if expr.startswith("return") and expr.endswith(";"):
+    if (expr := reduce_lambda_text(lamb.content)) is not None:
         # Convert a lambda returning a simple expression to just that expression
-        expr = cg.RawExpression(expr[6:-1].strip())
+        expr = cg.RawExpression(expr)
         # Don't cast if the return type is a class
         if isinstance(lamb.return_type, MockObjClass):
             return expr
@@ -106,7 +141,7 @@ def call_lambda(lamb: LambdaExpression):
     # not from user input, so they're safe to use directly
     if lamb.parameters and lamb.parameters.parameters:
         return CallExpression(
-            lamb, *[MockObj(x.id) for x in lamb.parameters.parameters]
+            lamb, *(parameter_ref(x.id) for x in lamb.parameters.parameters)
         )
     return CallExpression(lamb)
 
@@ -122,10 +157,11 @@ class LValidator:
         self.rtype = rtype
         self.retmapper = retmapper
         self.requires = requires
+        self.requires_validator = requires_component(requires) if requires else None
 
     def __call__(self, value):
-        if self.requires:
-            value = requires_component(self.requires)(value)
+        if self.requires_validator is not None:
+            value = self.requires_validator(value)
         if isinstance(value, cv.Lambda):
             return cv.returning_lambda(value)
         return self.validator(value)
@@ -164,12 +200,22 @@ class LvConstant(LValidator):
     The property `one_of` has the single case validator, and `several_of` allows a list of constants.
     """
 
+    # Validators for (prefix, choices), shared by constants with the same choices
+    choice_validators: dict[tuple, tuple] = {}
+    # Constants created by extend(), keyed by (prefix, choices, typename)
+    extended: dict[tuple, "LvConstant"] = {}
+
     def __init__(self, prefix: str, *choices, typename=None):
         self.prefix = prefix
         self.choices = tuple(x.upper() for x in choices)
         self.typename = typename or prefix.lower() + "t"
-        prefixed_choices = [prefix + v.upper() for v in choices]
-        prefixed_validator = cv.one_of(*prefixed_choices, upper=True)
+        key = (prefix, self.choices)
+        if (validators := LvConstant.choice_validators.get(key)) is None:
+            validators = LvConstant.choice_validators[key] = (
+                cv.one_of(*(prefix + v for v in self.choices), upper=True),
+                cv.one_of(*self.choices, upper=True),
+            )
+        prefixed_validator, choice_validator = validators
 
         @schema_extractor("one_of")
         def validator(value):
@@ -177,18 +223,33 @@ class LvConstant(LValidator):
                 return self.choices
             if isinstance(value, str) and value.startswith(self.prefix):
                 return prefixed_validator(value)
-            return self.prefix + cv.one_of(*choices, upper=True)(value)
+            return self.prefix + choice_validator(value)
 
         super().__init__(validator, rtype=cg.uint32)
+        # The literal for each choice, shared by all single value lookups
+        self.literals = {c: literal(prefix + c) for c in self.choices}
         self.retmapper = self.mapper
-        self.one_of = LValidator(validator, cg.uint32, retmapper=self.mapper)
-        self.several_of = LValidator(
+
+    @functools.cached_property
+    def one_of(self):
+        return LValidator(self.validator, cg.uint32, retmapper=self.mapper)
+
+    @functools.cached_property
+    def several_of(self):
+        return LValidator(
             cv.ensure_list(self.one_of), cg.uint32, retmapper=self.mapper
         )
 
     def mapper(self, value):
         if not isinstance(value, list):
-            value = [value]
+            value = str(value)
+            key = value.removeprefix(self.prefix).upper()
+            if (result := self.literals.get(key)) is not None:
+                return result
+            value = value.upper()
+            if not value.startswith(self.prefix):
+                value = self.prefix + value
+            return literal(value)
         value = [
             (
                 str(v).upper()
@@ -210,14 +271,18 @@ class LvConstant(LValidator):
         :param choices: The extra choices
         :return: A new LVConstant instance
         """
-        return LvConstant(
-            self.prefix, *(self.choices + choices), typename=self.typename
-        )
+        choices = self.choices + tuple(x.upper() for x in choices)
+        key = (self.prefix, choices, self.typename)
+        if (result := LvConstant.extended.get(key)) is None:
+            result = LvConstant.extended[key] = LvConstant(
+                self.prefix, *choices, typename=self.typename
+            )
+        return result
 
     def __getattr__(self, item):
-        if item.upper() not in self.choices:
+        if (result := self.literals.get(item.upper())) is None:
             raise AttributeError(f"{item} not one of {self.choices}")
-        return self.mapper(item)
+        return result
 
 
 # Parts
@@ -240,12 +305,13 @@ TYPE_NONE = "none"
 
 DIRECTIONS = LvConstant("LV_DIR_", "LEFT", "RIGHT", "BOTTOM", "TOP")
 
-LV_FONTS = list(f"montserrat_{s}" for s in range(8, 50, 2)) + [
+LV_FONTS = (
+    *(f"montserrat_{s}" for s in range(8, 50, 2)),
     "dejavu_16_persian_hebrew",
     "simsun_16_cjk",
     "unscii_8",
     "unscii_16",
-]
+)
 
 LV_EVENT_MAP = {
     # Input device events
@@ -320,10 +386,17 @@ LV_EVENT_MAP = {
     "ALL_EVENTS": "ALL",
 }
 
-LV_EVENT_TRIGGERS = tuple(f"on_{x.lower()}" for x in LV_EVENT_MAP)
+# Map trigger config keys directly to the LVGL event constant names
+LV_EVENT_TRIGGER_MAP = {
+    f"on_{k.lower()}": f"LV_EVENT_{v}" for k, v in LV_EVENT_MAP.items()
+}
+LV_EVENT_TRIGGERS = tuple(LV_EVENT_TRIGGER_MAP)
 SWIPE_TRIGGERS = tuple(
     f"on_swipe_{x.lower()}" for x in DIRECTIONS.choices + ("up", "down")
 )
+# Sets of the above for membership tests; the tuples retain the ordering for schema generation
+LV_EVENT_TRIGGER_SET = frozenset(LV_EVENT_TRIGGERS)
+SWIPE_TRIGGER_SET = frozenset(SWIPE_TRIGGERS)
 
 
 LV_ANIM = LvConstant(
@@ -745,11 +818,14 @@ LV_SCALE_MODE = LvConstant(
 DEFAULT_ESPHOME_FONT = "esphome_lv_default_font"
 
 
-def join_enums(enums, prefix=""):
-    enums = list(enums)
-    enums.sort()
+@functools.lru_cache(maxsize=256)
+def _join_enums_text(enums: frozenset, prefix: str) -> str:
     # If a prefix is provided, prepend each constant with the prefix, and assume that all the constants are within the
     # same namespace, otherwise cast to int to avoid triggering warnings about mixing enum types.
     if prefix:
-        return literal("|".join(f"{prefix}{e.upper()}" for e in enums))
-    return literal("|".join(f"(int){e.upper()}" for e in enums))
+        return "|".join(f"{prefix}{e.upper()}" for e in sorted(enums))
+    return "|".join(f"(int){e.upper()}" for e in sorted(enums))
+
+
+def join_enums(enums, prefix=""):
+    return literal(_join_enums_text(frozenset(enums), prefix))
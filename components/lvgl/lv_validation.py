@@ -534,8 +534,10 @@ def is_lv_font(font):
 
 class LvFont(LValidator):
     def __init__(self):
+        builtin_font_validator = cv.one_of(*LV_FONTS, lower=True)
+
         def lv_builtin_font(value):
-            fontval = cv.one_of(*LV_FONTS, lower=True)(value)
+            fontval = builtin_font_validator(value)
             lv_fonts_used.add(fontval)
             return fontval
 
@@ -564,10 +566,13 @@ class LvFont(LValidator):
 lv_font = LvFont()
 
 
+ANIM_ON_OFF = LvConstant("LV_ANIM_", "OFF", "ON")
+
+
 def animated(value):
     if isinstance(value, bool):
         value = "ON" if value else "OFF"
-    return LvConstant("LV_ANIM_", "OFF", "ON").one_of(value)
+    return ANIM_ON_OFF.one_of(value)
 
 
 def key_code(value):
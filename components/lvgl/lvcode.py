@@ -177,6 +177,28 @@ class LambdaContext(CodeContext):
         return self
 
 
+async def single_lambda(
+    expression: Expression | Statement,
+    parameters: list[tuple[SafeExpType, str]] = None,
+    return_type: SafeExpType = cg.void,
+    where=None,
+) -> LambdaExpression:
+    """
+    Create a lambda consisting of a single expression or statement. This is equivalent to
+    adding the expression inside a LambdaContext, but without switching the current code context.
+    :param expression: The expression or statement forming the lambda body
+    :param parameters: The lambda parameters
+    :param return_type: The lambda return type
+    :param where: An object to identify the source of the line marks
+    :return: The lambda expression
+    """
+    context = LambdaContext(parameters, return_type=return_type, where=where)
+    for mark in get_line_marks(where):
+        context.add(RawStatement(mark))
+    context.add(expression)
+    return await context.get_lambda()
+
+
 class LvContext(LambdaContext):
     """
     Code generation into the LVGL initialisation code, called before setup() and loop()
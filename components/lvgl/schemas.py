@@ -1,4 +1,5 @@
 from collections.abc import Callable
+import functools
 
 from esphome import config_validation as cv
 from esphome.automation import Trigger, validate_automation
@@ -300,15 +301,22 @@ FLAG_SCHEMA = cv.Schema({cv.Optional(flag): lvalid.lv_bool for flag in df.OBJ_FL
 FLAG_LIST = cv.ensure_list(df.LV_OBJ_FLAG.one_of)
 
 
+STATE_FLAG_SCHEMA = STATE_SCHEMA.extend(FLAG_SCHEMA)
+
+
+@functools.lru_cache(maxsize=None)
+def _part_schema(parts: tuple):
+    return STATE_FLAG_SCHEMA.extend({cv.Optional(part): STATE_SCHEMA for part in parts})
+
+
 def part_schema(parts):
     """
     Generate a schema for the various parts (e.g. main:, indicator:) of a widget type
+    The schema is shared between widget types with the same parts, so callers must extend it rather than modify it.
     :param parts:  The parts to include
     :return: The schema
     """
-    return STATE_SCHEMA.extend(FLAG_SCHEMA).extend(
-        {cv.Optional(part): STATE_SCHEMA for part in parts}
-    )
+    return _part_schema(tuple(parts))
 
 
 def automation_schema(typ: LvType):
@@ -437,6 +445,11 @@ ALL_STYLES = {
     cv.Optional(df.CONF_PAD_ROW): lvalid.padding,
     cv.Optional(df.CONF_PAD_COLUMN): lvalid.padding,
 }
+# Lookup tables for code generation: the style property names, and the processors for those with LVGL validators
+ALL_STYLES_KEYS = frozenset(str(k) for k in ALL_STYLES)
+STYLE_PROCESSORS = {
+    str(k): v.process for k, v in ALL_STYLES.items() if isinstance(v, df.LValidator)
+}
 
 
 def strip_defaults(schema: cv.Schema):
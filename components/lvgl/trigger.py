@@ -13,9 +13,9 @@ from .defines import (
     CONF_ALIGN,
     CONF_ALIGN_TO,
     DIRECTIONS,
-    LV_EVENT_MAP,
-    LV_EVENT_TRIGGERS,
-    SWIPE_TRIGGERS,
+    LV_EVENT_TRIGGER_MAP,
+    LV_EVENT_TRIGGER_SET,
+    SWIPE_TRIGGER_SET,
     literal,
 )
 from .lvcode import (
@@ -54,17 +54,17 @@ async def generate_triggers():
             for event, conf in {
                 event: conf
                 for event, conf in w.config.items()
-                if event in LV_EVENT_TRIGGERS
+                if event in LV_EVENT_TRIGGER_SET
             }.items():
                 conf = conf[0]
                 w.add_flag("LV_OBJ_FLAG_CLICKABLE")
-                event = literal("LV_EVENT_" + LV_EVENT_MAP[event[3:].upper()])
+                event = literal(LV_EVENT_TRIGGER_MAP[event])
                 await add_trigger(conf, w, event)
 
             for event, conf in {
                 event: conf
                 for event, conf in w.config.items()
-                if event in SWIPE_TRIGGERS
+                if event in SWIPE_TRIGGER_SET
             }.items():
                 conf = conf[0]
                 dir = event[9:].upper()
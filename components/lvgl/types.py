@@ -14,6 +14,7 @@ class LvType(cg.MockObjClass):
         self.value = kwargs.pop("lvalue", lambda w: w.obj)
         self.has_on_value = kwargs.pop("has_on_value", False)
         self.value_property = None
+        self._name = self.base.removeprefix("lv_").removesuffix("_t")
 
     def get_arg_type(self):
         if len(self.args) == 0:
@@ -22,7 +23,7 @@ class LvType(cg.MockObjClass):
 
     @property
     def name(self):
-        return self.base.removeprefix("lv_").removesuffix("_t")
+        return self._name
 
 
 class LvNumber(LvType):
@@ -1,4 +1,5 @@
 import builtins
+import functools
 import sys
 from typing import Any, Union
 
@@ -38,6 +39,9 @@ from ..defines import (
     CONF_STYLE_TRANSITION_TIME,
     CONF_STYLES,
     CONF_WIDGETS,
+    KEY_GRID_TEMPLATES,
+    KEY_TRANSITION_PROPS,
+    KEY_TRANSITIONS,
     OBJ_FLAGS,
     PARTS,
     STATES,
@@ -45,6 +49,7 @@ from ..defines import (
     TYPE_GRID,
     LValidator,
     call_lambda,
+    get_data,
     join_enums,
     literal,
 )
@@ -65,7 +70,6 @@ from ..types import (
     LvCompound,
     LvType,
     ObjUpdateAction,
-    lv_coord_t,
     lv_obj_t,
     lv_obj_t_ptr,
 )
@@ -76,11 +80,67 @@ theme_widget_map = {}
 styles_used = set()
 
 
+@functools.lru_cache(maxsize=256)
+def _cast_enums_text(text: str, cast: str) -> str:
+    if "|" in text:
+        return f"({cast})({text})"
+    return text
+
+
+def cast_enums(value, cast: str) -> MockObj:
+    """
+    Cast a combination of enum values to the type expected by an LVGL function. A single value needs no cast.
+    :param value: The enum value(s), as text or an expression
+    :param cast: The type to cast to, e.g. lv_state_t
+    :return: The expression
+    """
+    return literal(_cast_enums_text(str(value), cast))
+
+
+def _part_state(part: str, state: str):
+    part = "LV_PART_" + part.upper()
+    state = "LV_STATE_" + state.upper()
+    if state == "LV_STATE_DEFAULT":
+        return literal(part)
+    if part == "LV_PART_MAIN":
+        return literal(state)
+    return join_enums((state, part))
+
+
+# The style selector for each combination of part and state
+PART_STATE_LITERALS = {
+    (part, state): _part_state(part, state) for part in PARTS for state in STATES
+}
+
+
+def part_state_literal(part: str, state: str):
+    """
+    Get the style selector for a part and state, e.g. LV_STATE_PRESSED|LV_PART_KNOB
+    :param part: The part name, e.g. "knob"
+    :param state: The state name, e.g. "pressed"
+    :return: The selector expression
+    """
+    if (result := PART_STATE_LITERALS.get((part, state))) is None:
+        result = _part_state(part, state)
+    return result
+
+
 class WidgetType:
     """
     Describes a type of Widget, e.g. "bar" or "line"
     """
 
+    __slots__ = (
+        "name",
+        "lv_name",
+        "w_type",
+        "parts",
+        "schema",
+        "modify_schema",
+        "_mock_obj",
+        "has_lv_type",
+    )
+
     def __init__(
         self,
         name: str,
@@ -103,6 +163,8 @@ class WidgetType:
         self.name = name
         self.lv_name = lv_name or name
         self.w_type = w_type
+        # Whether the C type describes its own value and arguments
+        self.has_lv_type = isinstance(w_type, LvType)
         self.parts = parts
         if not isinstance(schema, Schema):
             schema = Schema(schema or {})
@@ -112,11 +174,10 @@ class WidgetType:
         if not isinstance(modify_schema, Schema):
             modify_schema = Schema(modify_schema)
         self.modify_schema = modify_schema
-        self.mock_obj = MockObj(f"lv_{self.lv_name}", "_")
+        self._mock_obj = None
 
         # Local import to avoid circular import
         from ..automation import update_to_code
-        from ..schemas import WIDGET_TYPES, base_update_schema
 
         if not is_mock:
             if self.name in WIDGET_TYPES:
@@ -130,6 +191,16 @@ class WidgetType:
                 base_update_schema(self, self.parts).extend(self.modify_schema),
             )(update_to_code)
 
+    @property
+    def mock_obj(self):
+        """
+        The prefix for calls to this widget's LVGL functions, e.g. lv_arc_
+        Created on first use, since only numeric widgets need it.
+        """
+        if self._mock_obj is None:
+            self._mock_obj = MockObj(f"lv_{self.lv_name}", "_")
+        return self._mock_obj
+
     @property
     def animated(self):
         return False
@@ -165,16 +236,8 @@ class WidgetType:
         w = Widget.create(wid, var, self, config)
         if theme := theme_widget_map.get(self.w_type.name):
             for part, states in theme.items():
-                part = "LV_PART_" + part.upper()
                 for state, style in states.items():
-                    state = "LV_STATE_" + state.upper()
-                    if state == "LV_STATE_DEFAULT":
-                        lv_state = literal(part)
-                    elif part == "LV_PART_MAIN":
-                        lv_state = literal(state)
-                    else:
-                        lv_state = join_enums((state, part))
-                    w.add_style(style, lv_state)
+                    w.add_style(style, part_state_literal(part, state))
         await set_obj_properties(w, config)
         await add_widgets(w, config)
         await self.to_code(w, config)
@@ -272,14 +335,10 @@ class Widget:
         return w
 
     def add_state(self, state):
-        if "|" in state:
-            state = f"(lv_state_t)({state})"
-        return lv_obj.add_state(self.obj, literal(state))
+        return lv_obj.add_state(self.obj, cast_enums(state, "lv_state_t"))
 
     def clear_state(self, state):
-        if "|" in state:
-            state = f"(lv_state_t)({state})"
-        return lv_obj.remove_state(self.obj, literal(state))
+        return lv_obj.remove_state(self.obj, cast_enums(state, "lv_state_t"))
 
     def has_state(self, state):
         return (lv_expr.obj_get_state(self.obj) & literal(state)) != 0
@@ -291,19 +350,13 @@ class Widget:
         return self.has_state(LV_STATE.CHECKED)
 
     def add_flag(self, flag):
-        if "|" in flag:
-            flag = f"(lv_obj_flag_t)({flag})"
-        return lv_obj.add_flag(self.obj, literal(flag))
+        return lv_obj.add_flag(self.obj, cast_enums(flag, "lv_obj_flag_t"))
 
     def clear_flag(self, flag):
-        if "|" in flag:
-            flag = f"(lv_obj_flag_t)({flag})"
-        return lv_obj.remove_flag(self.obj, literal(flag))
+        return lv_obj.remove_flag(self.obj, cast_enums(flag, "lv_obj_flag_t"))
 
     def add_style(self, style_id, state=LV_STATE.DEFAULT):
-        if "|" in state:
-            state = f"(lv_state_t)({state})"
-        lv_obj.add_style(self.obj, MockObj(style_id), literal(state))
+        lv_obj.add_style(self.obj, MockObj(style_id), cast_enums(state, "lv_state_t"))
 
     async def set_property(
         self, prop, value, animated: bool = None, lv_name=None, processor=None
@@ -316,15 +369,13 @@ class Widget:
         :param lv_name:  The base type of the widget e.g. "obj"
         """
 
-        from ..schemas import ALL_STYLES, remap_property
-
         if isinstance(value, dict):
             value = value.get(prop)
             if value is None:
                 return
-            if not processor and isinstance(ALL_STYLES.get(prop), LValidator):
-                processor = ALL_STYLES[prop]
-            if isinstance(processor, LValidator):
+            if not processor:
+                processor = STYLE_PROCESSORS.get(prop)
+            elif isinstance(processor, LValidator):
                 processor = processor.process
             if processor:
                 value = await processor(value)
@@ -349,7 +400,7 @@ class Widget:
             )
 
     def get_property(self, prop, ltype=None):
-        ltype = ltype or self.__type_base()
+        ltype = ltype or self.__type_base
         return cg.RawExpression(f"lv_{ltype}_get_{prop}({self.obj})")
 
     def set_style(self, prop, value, state=LV_STATE.DEFAULT):
@@ -360,6 +411,7 @@ class Widget:
             value = literal(value)
         lv.call(f"obj_set_style_{prop}", self.obj, value, state)
 
+    @functools.cached_property
     def __type_base(self):
         wtype = self.type.w_type
         base = str(wtype)
@@ -371,25 +423,25 @@ class Widget:
         return f"({self.var}, {self.type})"
 
     def get_args(self):
-        if isinstance(self.type.w_type, LvType):
+        if self.type.has_lv_type:
             return self.type.w_type.args
         return [(lv_obj_t_ptr, "obj")]
 
     def get_value(self):
-        if isinstance(self.type.w_type, LvType):
-            result = self.type.w_type.value(self)
-            if isinstance(result, builtins.list):
-                return result[0]
-            return result
-        return self.obj
+        if not self.type.has_lv_type:
+            return self.obj
+        result = self.type.w_type.value(self)
+        if isinstance(result, builtins.list):
+            return result[0]
+        return result
 
     def get_values(self):
-        if isinstance(self.type.w_type, LvType):
-            result = self.type.w_type.value(self)
-            if isinstance(result, builtins.list):
-                return result
-            return [result]
-        return [self.obj]
+        if not self.type.has_lv_type:
+            return [self.obj]
+        result = self.type.w_type.value(self)
+        if isinstance(result, builtins.list):
+            return result
+        return [result]
 
     def get_number_value(self):
         value = self.type.mock_obj.get_value(self.obj)
@@ -469,7 +521,14 @@ async def get_widgets(config: Union[dict, list], id: str = CONF_ID) -> list[Widg
         return []
     if not isinstance(config, builtins.list):
         config = [config]
-    return [await get_widget_(c[id]) for c in config if id in c]
+    result = []
+    for c in config:
+        if id in c:
+            # Only wait if the widget has not been created yet
+            if (w := widget_map.get(c[id])) is None:
+                w = await get_widget_(c[id])
+            result.append(w)
+    return result
 
 
 def collect_props(config):
@@ -479,19 +538,15 @@ def collect_props(config):
     :return:
     """
 
-    from ..schemas import ALL_STYLES
-
     props = {}
-    for prop in [*ALL_STYLES, *OBJ_FLAGS, CONF_STYLES, CONF_GROUP]:
-        if prop in config:
-            if prop == CONF_SCALE:
-                props[CONF_SCALE + "_x"] = config[prop]
-                props[CONF_SCALE + "_y"] = config[prop]
-            else:
-                props[prop] = config[prop]
-    # Collect transition properties
-    for prop in [CONF_STYLE_TRANSITION_TIME, CONF_STYLE_TRANSITION_DELAY, CONF_STYLE_TRANSITION_PATH]:
-        if prop in config:
+    # Keep the order of COLLECTED_PROPS, so that e.g. pad_all is applied before pad_top
+    for prop in sorted(
+        (k for k in config if k in COLLECTED_PROPS), key=COLLECTED_PROPS.get
+    ):
+        if prop == CONF_SCALE:
+            props[CONF_SCALE + "_x"] = config[prop]
+            props[CONF_SCALE + "_y"] = config[prop]
+        else:
             props[prop] = config[prop]
     return props
 
@@ -522,11 +577,58 @@ def collect_parts(config):
     return parts
 
 
+def get_grid_template(tracks: list):
+    """
+    Get a grid row or column descriptor array, shared by all grids with the same template.
+    The array is declared globally on first use.
+    :param tracks: The track sizes
+    :return: The array
+    """
+    template = "{" + ",".join(str(x) for x in tracks) + ", LV_GRID_TEMPLATE_LAST}"
+    templates = get_data(KEY_GRID_TEMPLATES)
+    if (array_var := templates.get(template)) is None:
+        array_var = templates[template] = f"lv_grid_dsc_{len(templates)}"
+        # Declared globally, the first user may be inside a block scope
+        cg.add_global(
+            RawStatement(f"static const lv_coord_t {array_var}[] = {template};")
+        )
+    return MockObj(array_var)
+
+
+def get_transition(prop_enums: tuple, path_func: str, time_ms: int, delay_ms: int):
+    """
+    Get a transition descriptor, shared by all widgets with the same transition.
+    The property array and descriptor are declared globally on first use, the descriptor is (re)initialised
+    in the current context since that may be the first to run.
+    :param prop_enums: The LV_STYLE_* properties to animate
+    :param path_func: The animation path function
+    :param time_ms: The transition time
+    :param delay_ms: The transition delay
+    :return: The name of the descriptor variable
+    """
+    props_arrays = get_data(KEY_TRANSITION_PROPS)
+    if (props_var := props_arrays.get(prop_enums)) is None:
+        props_var = props_arrays[prop_enums] = f"lv_tr_props_{len(props_arrays)}"
+        props_str = "{" + ", ".join(prop_enums) + ", 0}"
+        cg.add_global(
+            RawStatement(f"static const lv_style_prop_t {props_var}[] = {props_str};")
+        )
+    transitions = get_data(KEY_TRANSITIONS)
+    key = (props_var, path_func, time_ms, delay_ms)
+    if (dsc_var := transitions.get(key)) is None:
+        dsc_var = transitions[key] = f"lv_tr_dsc_{len(transitions)}"
+        cg.add_global(RawStatement(f"static lv_style_transition_dsc_t {dsc_var};"))
+    lv_add(
+        RawStatement(
+            f"lv_style_transition_dsc_init(&{dsc_var}, {props_var}, {path_func}, {time_ms}, {delay_ms}, NULL);"
+        )
+    )
+    return dsc_var
+
+
 async def set_obj_properties(w: Widget, config):
     """Generate a list of C++ statements to apply properties to an lv_obj_t"""
 
-    from ..schemas import ALL_STYLES, OBJ_PROPERTIES, remap_property
-
     if layout := config.get(CONF_LAYOUT):
         layout_type: str = layout[CONF_TYPE]
         add_lv_use(layout_type)
@@ -536,17 +638,12 @@ async def set_obj_properties(w: Widget, config):
         if (pad_column := layout.get(CONF_PAD_COLUMN)) is not None:
             w.set_style(CONF_PAD_COLUMN, pad_column)
         if layout_type == TYPE_GRID:
-            wid = config[CONF_ID]
-            rows = [str(x) for x in layout[CONF_GRID_ROWS]]
-            rows = "{" + ",".join(rows) + ", LV_GRID_TEMPLATE_LAST}"
-            row_id = ID(f"{wid}_row_dsc", is_declaration=True, type=lv_coord_t)
-            row_array = cg.static_const_array(row_id, cg.RawExpression(rows))
-            w.set_style("grid_row_dsc_array", row_array)
-            columns = [str(x) for x in layout[CONF_GRID_COLUMNS]]
-            columns = "{" + ",".join(columns) + ", LV_GRID_TEMPLATE_LAST}"
-            column_id = ID(f"{wid}_column_dsc", is_declaration=True, type=lv_coord_t)
-            column_array = cg.static_const_array(column_id, cg.RawExpression(columns))
-            w.set_style("grid_column_dsc_array", column_array)
+            w.set_style(
+                "grid_row_dsc_array", get_grid_template(layout[CONF_GRID_ROWS])
+            )
+            w.set_style(
+                "grid_column_dsc_array", get_grid_template(layout[CONF_GRID_COLUMNS])
+            )
             w.set_style(
                 CONF_GRID_COLUMN_ALIGN, literal(layout.get(CONF_GRID_COLUMN_ALIGN))
             )
@@ -565,36 +662,30 @@ async def set_obj_properties(w: Widget, config):
         # Collect all style properties across all states for this part
         # (needed for transition descriptors to cover all animated properties)
         all_part_style_props = set()
-        for _state_name, _state_props in states.items():
-            for prop in _state_props:
-                if prop in ALL_STYLES:
-                    remapped = remap_property(prop)
-                    # pad_all is a convenience setter (lv_obj_set_style_pad_all)
-                    # but LV_STYLE_PAD_ALL doesn't exist as an enum in LVGL 9.x.
-                    # Expand it into the four individual padding properties.
-                    if remapped == "pad_all":
-                        all_part_style_props.update(
-                            ("pad_top", "pad_bottom", "pad_left", "pad_right")
-                        )
-                    else:
-                        all_part_style_props.add(remapped)
-
-        part = "LV_PART_" + part.upper()
+        # The style properties of each state, paired with the state and its full properties
+        state_styles = []
         for state, props in states.items():
-            state = "LV_STATE_" + state.upper()
-            if state == "LV_STATE_DEFAULT":
-                lv_state = literal(part)
-            elif part == "LV_PART_MAIN":
-                lv_state = literal(state)
-            else:
-                lv_state = join_enums((state, part))
+            style_props = [(k, v) for k, v in props.items() if k in ALL_STYLES_KEYS]
+            state_styles.append((state, props, style_props))
+            for prop, _ in style_props:
+                remapped = remap_property(prop)
+                # pad_all is a convenience setter (lv_obj_set_style_pad_all)
+                # but LV_STYLE_PAD_ALL doesn't exist as an enum in LVGL 9.x.
+                # Expand it into the four individual padding properties.
+                if remapped == "pad_all":
+                    all_part_style_props.update(
+                        ("pad_top", "pad_bottom", "pad_left", "pad_right")
+                    )
+                else:
+                    all_part_style_props.add(remapped)
+
+        for state, props, style_props in state_styles:
+            lv_state = part_state_literal(part, state)
             for style_id in props.get(CONF_STYLES, ()):
                 w.add_style(style_id, lv_state)
-            for prop, value in {
-                k: v for k, v in props.items() if k in ALL_STYLES
-            }.items():
-                if isinstance(ALL_STYLES[prop], LValidator):
-                    value = await ALL_STYLES[prop].process(value)
+            for prop, value in style_props:
+                if processor := STYLE_PROCESSORS.get(prop):
+                    value = await processor(value)
                 prop_r = remap_property(prop)
                 w.set_style(prop_r, value, lv_state)
             # Handle style transitions for animated state changes
@@ -605,20 +696,11 @@ async def set_obj_properties(w: Widget, config):
                 path_func = ANIM_PATHS.get(trans_path, "lv_anim_path_ease_in_out")
                 time_ms = int(trans_time.total_milliseconds)
                 delay_ms = int(trans_delay.total_milliseconds) if trans_delay else 0
-                # Generate unique variable names from widget ID and state
-                wid_str = str(config[CONF_ID])
-                state_str = state.replace("LV_STATE_", "").lower()
-                part_str = part.replace("LV_PART_", "").lower()
-                base_name = f"{wid_str}_{part_str}_{state_str}"
-                props_var = f"{base_name}_tr_props"
-                dsc_var = f"{base_name}_tr_dsc"
                 # Build LV_STYLE_* property enum list for transition
-                prop_enums = sorted(f"LV_STYLE_{p.upper()}" for p in all_part_style_props)
-                props_str = "{" + ", ".join(prop_enums) + ", 0}"
-                # Generate C++ transition descriptor code
-                lv_add(RawStatement(f"static const lv_style_prop_t {props_var}[] = {props_str};"))
-                lv_add(RawStatement(f"static lv_style_transition_dsc_t {dsc_var};"))
-                lv_add(RawStatement(f"lv_style_transition_dsc_init(&{dsc_var}, {props_var}, {path_func}, {time_ms}, {delay_ms}, NULL);"))
+                prop_enums = tuple(
+                    sorted(f"LV_STYLE_{p.upper()}" for p in all_part_style_props)
+                )
+                dsc_var = get_transition(prop_enums, path_func, time_ms, delay_ms)
                 w.set_style("transition", literal(f"&{dsc_var}"), lv_state)
     if group := config.get(CONF_GROUP):
         group = await cg.get_variable(group)
@@ -673,7 +755,9 @@ async def set_obj_properties(w: Widget, config):
                 cond.else_()
                 w.clear_state(state)
     for property in OBJ_PROPERTIES:
-        await w.set_property(property, config, lv_name="obj")
+        # Skip the call for absent properties, most widgets set only a few of them
+        if property in config:
+            await w.set_property(property, config, lv_name="obj")
 
 
 async def add_widgets(parent: Widget, config: dict):
@@ -697,8 +781,6 @@ async def widget_to_code(w_cnfig, w_type: WidgetType | str, parent) -> Widget:
     :return:
     """
 
-    from ..schemas import WIDGET_TYPES
-
     spec: WidgetType = (
         w_type if isinstance(w_type, WidgetType) else WIDGET_TYPES[w_type]
     )
@@ -711,3 +793,31 @@ class NumberType(WidgetType):
 
     def get_min(self, config: dict):
         return int(config.get(CONF_MIN_VALUE, 0))
+
+
+# The schemas module depends on WidgetType, so is imported once everything above is defined
+from ..schemas import (  # noqa: E402
+    ALL_STYLES,
+    ALL_STYLES_KEYS,
+    OBJ_PROPERTIES,
+    STYLE_PROCESSORS,
+    WIDGET_TYPES,
+    base_update_schema,
+    remap_property,
+)
+
+# All the properties gathered by collect_props, including transition properties, mapped to the order they are applied
+COLLECTED_PROPS = {
+    str(prop): index
+    for index, prop in enumerate(
+        (
+            *ALL_STYLES,
+            *OBJ_FLAGS,
+            CONF_STYLES,
+            CONF_GROUP,
+            CONF_STYLE_TRANSITION_TIME,
+            CONF_STYLE_TRANSITION_DELAY,
+            CONF_STYLE_TRANSITION_PATH,
+        )
+    )
+}
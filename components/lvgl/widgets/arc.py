@@ -30,7 +30,16 @@ from ..lv_validation import (
     lv_int,
     lv_positive_int,
 )
-from ..lvcode import EVENT_ARG, LambdaContext, lv, lv_add, lv_expr, lv_obj, lvgl_static
+from ..lvcode import (
+    EVENT_ARG,
+    LambdaContext,
+    LocalVariable,
+    lv,
+    lv_add,
+    lv_expr,
+    lv_obj,
+    lvgl_static,
+)
 from ..types import LV_EVENT, LvNumber, lv_obj_t
 from . import NumberType, Widget, get_widget_
 
@@ -73,6 +82,14 @@ ARC_MODIFY_SCHEMA = cv.Schema(
     }
 )
 
+# The properties set in to_code, other than the value, with their validators.
+# start_angle and end_angle are mapped to bg_start_angle and bg_end_angle
+ARC_PROPS = tuple(
+    (str(prop), validator, str(prop).endswith("_angle"))
+    for prop, validator in ARC_MODIFY_SCHEMA.schema.items()
+    if prop != CONF_VALUE
+)
+
 
 class ArcType(NumberType):
     def __init__(self):
@@ -85,19 +102,16 @@ class ArcType(NumberType):
         )
 
     async def to_code(self, w: Widget, config):
-        for prop, validator in ARC_MODIFY_SCHEMA.schema.items():
-            if prop != CONF_VALUE:
-                # start_angle and end_angle are mapped to bg_start_angle and bg_end_angle
-                prop = str(prop)
-                if prop.endswith("_angle"):
-                    # Extract value using original config key before renaming
-                    value = config.get(prop)
-                    if value is not None:
-                        if isinstance(validator, LValidator):
-                            value = await validator.process(value)
-                        await w.set_property("bg_" + prop, value)
-                else:
-                    await w.set_property(prop, config, processor=validator)
+        for prop, validator, is_angle in ARC_PROPS:
+            if is_angle:
+                # Extract value using original config key before renaming
+                value = config.get(prop)
+                if value is not None:
+                    if isinstance(validator, LValidator):
+                        value = await validator.process(value)
+                    await w.set_property("bg_" + prop, value)
+            else:
+                await w.set_property(prop, config, processor=validator)
         if CONF_ADJUSTABLE in config:
             if not config[CONF_ADJUSTABLE]:
                 lv_obj.remove_style(w.obj, nullptr, LV_PART.KNOB)
@@ -113,24 +127,24 @@ class ArcType(NumberType):
             rotate_config = config[CONF_ROTATE_LABEL]
             label_w = await get_widget_(rotate_config[CONF_ID])
             offset = rotate_config[CONF_OFFSET]
-            # Register VALUE_CHANGED callback for ongoing rotation
             async with LambdaContext(EVENT_ARG, where=config[CONF_ID]) as context:
                 lv.arc_rotate_obj_to_angle(w.obj, label_w.obj, offset)
-            lv_add(
-                lvgl_static.add_event_cb(
-                    w.obj, await context.get_lambda(), LV_EVENT.VALUE_CHANGED
+            # The same callback is used for both events, so generate it once
+            with LocalVariable(
+                "rotate_label", "auto", await context.get_lambda(), modifier=""
+            ) as rotate_cb:
+                # Register VALUE_CHANGED callback for ongoing rotation
+                lv_add(
+                    lvgl_static.add_event_cb(w.obj, rotate_cb, LV_EVENT.VALUE_CHANGED)
                 )
-            )
-            # Position label when page is actually displayed (not during init)
-            async with LambdaContext(EVENT_ARG, where=config[CONF_ID]) as screen_ctx:
-                lv.arc_rotate_obj_to_angle(w.obj, label_w.obj, offset)
-            lv_add(
-                lvgl_static.add_event_cb(
-                    lv_expr.obj_get_screen(w.obj),
-                    await screen_ctx.get_lambda(),
-                    LV_EVENT.SCREEN_LOADED,
+                # Position label when page is actually displayed (not during init)
+                lv_add(
+                    lvgl_static.add_event_cb(
+                        lv_expr.obj_get_screen(w.obj),
+                        rotate_cb,
+                        LV_EVENT.SCREEN_LOADED,
+                    )
                 )
-            )
 
 
 arc_spec = ArcType()
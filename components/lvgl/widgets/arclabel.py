@@ -4,6 +4,8 @@ ESPHome compatible – LVGL 9.4
 Native arclabel API (angle_start / angle_size / offset)
 """
 
+from operator import itemgetter
+
 import esphome.config_validation as cv
 from esphome.const import CONF_ROTATION, CONF_TEXT
 
@@ -36,16 +38,28 @@ ARCLABEL_SCHEMA = cv.Schema(
     }
 )
 
+ARCLABEL_MODIFY_SCHEMA = cv.Schema(
+    {
+        cv.Optional(CONF_TEXT): lv_text,
+    }
+)
+
+# The geometry fields, all filled in by the schema defaults
+ARCLABEL_GEOMETRY = itemgetter(
+    CONF_RADIUS, CONF_START_ANGLE, CONF_END_ANGLE, CONF_ROTATION
+)
+
+
 class ArcLabelType(WidgetType):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(
             CONF_ARCLABEL,
             lv_arclabel_t,
             (CONF_MAIN,),
             ARCLABEL_SCHEMA,
-            modify_schema={
-                cv.Optional(CONF_TEXT): lv_text,
-            },
+            modify_schema=ARCLABEL_MODIFY_SCHEMA,
         )
 
     async def to_code(self, w: Widget, config):
@@ -54,36 +68,42 @@ class ArcLabelType(WidgetType):
         # ----------------------------
         # Text
         # ----------------------------
-        text = await lv_text.process(config[CONF_TEXT])
-        lv.arclabel_set_text(w.obj, text)
+        if CONF_TEXT in config:
+            text = await lv_text.process(config[CONF_TEXT])
+            lv.arclabel_set_text(w.obj, text)
+
+        # Update actions only carry the modify schema, i.e. the text. When creating,
+        # the schema defaults guarantee all the geometry is present.
+        if CONF_RADIUS not in config:
+            return
+        radius, start_angle, end_angle, rotation = ARCLABEL_GEOMETRY(config)
 
         # ----------------------------
         # Radius
         # ----------------------------
-        radius = await pixels.process(config.get(CONF_RADIUS, 100))
+        radius = await pixels.process(radius)
         lv.arclabel_set_radius(w.obj, radius)
 
         # ----------------------------
         # Start angle
         # ----------------------------
-        start_angle = config.get(CONF_START_ANGLE, 0)
-        lv.arclabel_set_angle_start(w.obj, start_angle)
+        # Like the offset, a new arclabel starts at angle 0
+        if start_angle:
+            lv.arclabel_set_angle_start(w.obj, start_angle)
 
         # ----------------------------
         # Arc size
         # ----------------------------
-        end_angle = config.get(CONF_END_ANGLE, 360)
-        angle_size = end_angle - start_angle
-        if angle_size <= 0:
-            angle_size += 360
-
+        # Wrap into the range (0, 360], an empty span meaning the full circle
+        angle_size = (end_angle - start_angle) % 360 or 360
         lv.arclabel_set_angle_size(w.obj, angle_size)
 
         # ----------------------------
         # Rotation / offset
         # ----------------------------
-        rotation = config.get(CONF_ROTATION, 0)
-        lv.arclabel_set_offset(w.obj, rotation)
+        # A new arclabel starts with a zero offset, so only set it when rotated
+        if rotation:
+            lv.arclabel_set_offset(w.obj, rotation)
 
         # ----------------------------
         # Object size (important)
@@ -91,63 +111,9 @@ class ArcLabelType(WidgetType):
         size = radius * 2 + 40
         lv.obj_set_size(w.obj, size, size)
 
-    async def to_code_update(self, w: Widget, config):
-        if CONF_TEXT in config:
-            text = await lv_text.process(config[CONF_TEXT])
-            lv.arclabel_set_text(w.obj, text)
-
     def get_uses(self):
         return ("label",)
 
 
 # Global instance
 arclabel_spec = ArcLabelType()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
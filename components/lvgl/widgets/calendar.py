@@ -26,6 +26,12 @@ HEADER_ARROW = "arrow"
 HEADER_DROPDOWN = "dropdown"
 HEADER_NONE = "none"
 
+# Years offered by the dropdown header, as a C string literal. A literal has static storage,
+# and identical literals are merged by the compiler, so every calendar shares one copy.
+DROPDOWN_YEAR_LIST = cg.RawExpression(
+    '"' + "\\n".join(str(y) for y in range(2036, 2019, -1)) + '"'
+)
+
 # Calendar returns selected date as year, month, day
 lv_calendar_t = LvType(
     "LvCalendarType",
@@ -44,32 +50,61 @@ lv_calendar_t = LvType(
 )
 
 
-def date_schema(required=False):
-    """Schema for date specification (year, month, day)"""
+def _date_schema(required):
+    key = cv.Required if required else cv.Optional
     return cv.Schema(
         {
-            cv.Required(CONF_YEAR) if required else cv.Optional(CONF_YEAR): cv.int_range(
-                min=1970, max=2099
-            ),
-            cv.Required(CONF_MONTH) if required else cv.Optional(CONF_MONTH): cv.int_range(
-                min=1, max=12
-            ),
-            cv.Required(CONF_DAY) if required else cv.Optional(CONF_DAY): cv.int_range(
-                min=1, max=31
-            ),
+            key(CONF_YEAR): cv.int_range(min=1970, max=2099),
+            key(CONF_MONTH): cv.int_range(min=1, max=12),
+            key(CONF_DAY): cv.int_range(min=1, max=31),
         }
     )
 
 
+# The date schemas are built once and shared by the widget and update action schemas
+REQUIRED_DATE_SCHEMA = _date_schema(True)
+OPTIONAL_DATE_SCHEMA = _date_schema(False)
+TEMPLATABLE_DATE_SCHEMA = cv.Schema(
+    {
+        cv.Optional(CONF_YEAR): cv.templatable(cv.int_),
+        cv.Optional(CONF_MONTH): cv.templatable(cv.int_),
+        cv.Optional(CONF_DAY): cv.templatable(cv.int_),
+    }
+)
+HIGHLIGHTED_DATES_SCHEMA = cv.ensure_list(REQUIRED_DATE_SCHEMA)
+
+
+def date_schema(required=False):
+    """Schema for date specification (year, month, day)"""
+    return REQUIRED_DATE_SCHEMA if required else OPTIONAL_DATE_SCHEMA
+
+
 def date_schema_templatable():
     """Schema for date specification with lambda support (for runtime updates)"""
-    return cv.Schema(
-        {
-            cv.Optional(CONF_YEAR): cv.templatable(cv.int_),
-            cv.Optional(CONF_MONTH): cv.templatable(cv.int_),
-            cv.Optional(CONF_DAY): cv.templatable(cv.int_),
-        }
+    return TEMPLATABLE_DATE_SCHEMA
+
+
+def format_date_array(dates):
+    """Format a list of dates as a C initializer for an lv_calendar_date_t array"""
+    body = ", ".join(
+        f"{{{date[CONF_YEAR]}, {date[CONF_MONTH]}, {date[CONF_DAY]}}}" for date in dates
     )
+    return f"{{{body}}}"
+
+
+def set_highlighted_dates(w: Widget, name: str, dates):
+    """
+    Declare a static array holding the dates, and set it as the calendar's highlighted dates
+    :param w: The calendar widget
+    :param name: The name of the array variable
+    :param dates: The list of dates
+    """
+    lv_add(
+        cg.RawExpression(
+            f"static lv_calendar_date_t {name}[] = {format_date_array(dates)}"
+        )
+    )
+    lv.calendar_set_highlighted_dates(w.obj, cg.RawExpression(name), len(dates))
 
 
 # Schema for runtime updates (header and day_names are creation-time only)
@@ -77,7 +112,7 @@ CALENDAR_MODIFY_SCHEMA = cv.Schema(
     {
         cv.Optional(CONF_TODAY_DATE): date_schema(),
         cv.Optional(CONF_SHOWED_DATE): date_schema(),
-        cv.Optional(CONF_HIGHLIGHTED_DATES): cv.ensure_list(date_schema(required=True)),
+        cv.Optional(CONF_HIGHLIGHTED_DATES): HIGHLIGHTED_DATES_SCHEMA,
     }
 )
 
@@ -119,14 +154,7 @@ class CalendarType(WidgetType):
             add_lv_use("CALENDAR_HEADER_DROPDOWN")
             lv.calendar_header_dropdown_create(w.obj)
             # LVGL default year list only goes to 2025. Set a wider range.
-            wid = str(config[CONF_ID])
-            year_list = "\\n".join(str(y) for y in range(2036, 2019, -1))
-            lv_add(cg.RawExpression(
-                f'static const char * {wid}_year_list = "{year_list}"'
-            ))
-            lv.calendar_header_dropdown_set_year_list(
-                w.obj, cg.RawExpression(f"{wid}_year_list")
-            )
+            lv.calendar_header_dropdown_set_year_list(w.obj, DROPDOWN_YEAR_LIST)
 
         # Set custom day names (array of 7 strings)
         if day_names := config.get(CONF_DAY_NAMES):
@@ -155,24 +183,7 @@ class CalendarType(WidgetType):
 
         # Set highlighted dates
         if highlighted := config.get(CONF_HIGHLIGHTED_DATES):
-            dates_count = len(highlighted)
-            if dates_count > 0:
-                wid = str(config[CONF_ID])
-                dates_elements = []
-                for date in highlighted:
-                    year = date[CONF_YEAR]
-                    month = date[CONF_MONTH]
-                    day = date[CONF_DAY]
-                    dates_elements.append(f"{{{year}, {month}, {day}}}")
-                dates_array_str = "{" + ", ".join(dates_elements) + "}"
-                lv_add(cg.RawExpression(
-                    f"static lv_calendar_date_t {wid}_highlighted_dates[] = {dates_array_str}"
-                ))
-                lv.calendar_set_highlighted_dates(
-                    w.obj,
-                    cg.RawExpression(f"{wid}_highlighted_dates"),
-                    dates_count,
-                )
+            set_highlighted_dates(w, f"{config[CONF_ID]}_highlighted_dates", highlighted)
 
     def get_uses(self):
         return ("calendar",)
@@ -189,7 +200,7 @@ calendar_spec = CalendarType()
             cv.Required(CONF_ID): cv.use_id(lv_calendar_t),
             cv.Optional(CONF_TODAY_DATE): date_schema_templatable(),
             cv.Optional(CONF_SHOWED_DATE): date_schema_templatable(),
-            cv.Optional(CONF_HIGHLIGHTED_DATES): cv.ensure_list(date_schema(required=True)),
+            cv.Optional(CONF_HIGHLIGHTED_DATES): HIGHLIGHTED_DATES_SCHEMA,
         }
     ),
 )
@@ -198,25 +209,23 @@ async def calendar_update_to_code(config, action_id, template_arg, args):
     widgets = await get_widgets(config)
 
     async def process_date_field(value, default):
-        """Process a date field that may be a lambda or a static value"""
+        """
+        Process a date field that may be a lambda or a static value
+        :return: The value expression, and whether it came from a lambda
+        """
         if isinstance(value, Lambda):
-            return call_lambda(
-                await cg.process_lambda(value, [], return_type=cg.int32)
-            )
-        return await lv_int.process(value if value is not None else default)
+            lamb = await cg.process_lambda(value, [], return_type=cg.int32)
+            return call_lambda(lamb), True
+        return await lv_int.process(value if value is not None else default), False
 
     async def do_calendar_update(w: Widget):
         # Update today's date
         if today := config.get(CONF_TODAY_DATE):
-            year = await process_date_field(today.get(CONF_YEAR), 2024)
-            month = await process_date_field(today.get(CONF_MONTH), 1)
-            day = await process_date_field(today.get(CONF_DAY), 1)
+            year, year_lambda = await process_date_field(today.get(CONF_YEAR), 2024)
+            month, month_lambda = await process_date_field(today.get(CONF_MONTH), 1)
+            day, day_lambda = await process_date_field(today.get(CONF_DAY), 1)
             # Guard against invalid dates (e.g. SNTP not yet synced returns 0)
-            has_lambda = any(
-                isinstance(today.get(k), Lambda)
-                for k in (CONF_YEAR, CONF_MONTH, CONF_DAY)
-            )
-            if has_lambda:
+            if year_lambda or month_lambda or day_lambda:
                 with LocalVariable("_td_y", cg.int32, year, modifier="") as y_var:
                     with LvConditional(literal(f"{y_var} > 0")):
                         lv.calendar_set_today_date(w.obj, y_var, month, day)
@@ -226,14 +235,10 @@ async def calendar_update_to_code(config, action_id, template_arg, args):
         # Update showed date
         # LVGL 9.4 API: lv_calendar_set_month_shown(obj, year, month) - no day param
         if showed := config.get(CONF_SHOWED_DATE):
-            year = await process_date_field(showed.get(CONF_YEAR), 2024)
-            month = await process_date_field(showed.get(CONF_MONTH), 1)
+            year, year_lambda = await process_date_field(showed.get(CONF_YEAR), 2024)
+            month, month_lambda = await process_date_field(showed.get(CONF_MONTH), 1)
             # Guard against invalid dates (e.g. SNTP not yet synced returns 0)
-            has_lambda = any(
-                isinstance(showed.get(k), Lambda)
-                for k in (CONF_YEAR, CONF_MONTH)
-            )
-            if has_lambda:
+            if year_lambda or month_lambda:
                 with LocalVariable("_sd_y", cg.int32, year, modifier="") as y_var:
                     with LvConditional(literal(f"{y_var} > 0")):
                         lv.calendar_set_month_shown(w.obj, y_var, month)
@@ -242,24 +247,7 @@ async def calendar_update_to_code(config, action_id, template_arg, args):
 
         # Update highlighted dates
         if highlighted := config.get(CONF_HIGHLIGHTED_DATES):
-            dates_count = len(highlighted)
-            if dates_count > 0:
-                wid = str(config[CONF_ID])
-                dates_elements = []
-                for date in highlighted:
-                    year = date[CONF_YEAR]
-                    month = date[CONF_MONTH]
-                    day = date[CONF_DAY]
-                    dates_elements.append(f"{{{year}, {month}, {day}}}")
-                dates_array_str = "{" + ", ".join(dates_elements) + "}"
-                lv_add(cg.RawExpression(
-                    f"static lv_calendar_date_t {wid}_hl_dates_upd[] = {dates_array_str}"
-                ))
-                lv.calendar_set_highlighted_dates(
-                    w.obj,
-                    cg.RawExpression(f"{wid}_hl_dates_upd"),
-                    dates_count,
-                )
+            set_highlighted_dates(w, f"{config[CONF_ID]}_hl_dates_upd", highlighted)
 
     return await action_to_code(
         widgets, do_calendar_update, action_id, template_arg, args, config